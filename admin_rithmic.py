@@ -1,12 +1,18 @@
 import os
+import sys
 import time
 import asyncio
+import atexit
+import contextlib
+import threading
 import logging
-import re
-import fnmatch
+import logging.handlers
+import math
+import queue
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import pandas as pd
+from collections import OrderedDict
 from dataclasses import dataclass
 
 # Rich TUI library for modern interface
@@ -16,11 +22,8 @@ try:
     from rich.progress import Progress, TaskID, BarColumn, TextColumn, TimeRemainingColumn, SpinnerColumn
     from rich.table import Table
     from rich.layout import Layout
-    from rich.live import Live
     from rich.text import Text
-    from rich.prompt import Prompt, Confirm
-    from rich.columns import Columns
-    from rich import box
+    from rich.prompt import Prompt
     from rich.align import Align
     RICH_AVAILABLE = True
 except ImportError:
@@ -28,23 +31,230 @@ except ImportError:
     print("⚠️  Rich library not available. Install with: pip install rich")
     print("Falling back to basic interface...")
 
-from async_rithmic import RithmicClient, TimeBarType, InstrumentType, Gateway, DataType
+# uvloop is optional and unavailable on Windows; asyncio's own loop is used without it
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+from sqlalchemy import text
+from async_rithmic import RithmicClient, TimeBarType, Gateway
 from async_rithmic import ReconnectionSettings, RetrySettings
 from config.chicago_gateway_config import get_chicago_gateway_config
 from shared.database.connection import get_async_session, TimescaleDBHelper, get_database_manager
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("rithmic_admin.log"),
-        logging.StreamHandler()
-    ]
-)
+# Configure logging. Records go through a queue to a listener thread, so
+# file and console writes never block the event loop
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler("rithmic_admin.log"),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# The queue handler only merges message and args; the real handlers format
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
 logger = logging.getLogger("rithmic_admin")
 
-@dataclass
+# Main menu entries as (key, label); both interfaces render from this table
+MENU_ITEMS = (
+    ("1", "Test Connections (DB + Rithmic)"),
+    ("2", "Search Symbols & Check Contracts"),
+    ("3", "Download Historical Data"),
+    ("4", "View TimescaleDB Data"),
+    ("5", "Initialize/Setup Database"),
+    ("0", "Exit"),
+)
+MENU_TEXT = "[bold yellow]Main Menu[/bold yellow]\n\n" + "\n".join(
+    f"[bold cyan]{key}.[/bold cyan] {label}" for key, label in MENU_ITEMS
+)
+PLAIN_MENU_LINES = tuple(f"{key}. {label}" for key, label in MENU_ITEMS)
+MENU_CHOICES = [key for key, _ in MENU_ITEMS]
+
+# 20-cell progress bars indexed by filled cells (one cell per 5%)
+PROGRESS_BARS = tuple(f"[{'█' * filled}{'░' * (20 - filled)}]" for filled in range(21))
+
+# Exchange -> ISO 10383 MIC for market_data.exchange_code; others map to themselves
+_EXCHANGE_CODES = {'CME': 'XCME'}
+
+# Rows per bulk insert while a download is still streaming in
+INSERT_BATCH_SIZE = 5000
+
+# Downloaded chunks allowed to wait for the writer before fetches pause
+BAR_QUEUE_SIZE = 4
+
+# Timeout per attempt when fetching a download chunk; one attempt per entry
+CHUNK_TIMEOUTS = (60.0, 120.0, 180.0)
+
+# Data type -> (bar type, table, chunk size, minimum chunk size). Chunk sizes
+# keep requests under the API's bar limit; truncated chunks are split in half
+# down to the minimum size
+DATA_TYPE_CONFIG = {
+    'second': (TimeBarType.SECOND_BAR, 'market_data_seconds', timedelta(hours=6), timedelta(hours=1)),
+    'minute': (TimeBarType.MINUTE_BAR, 'market_data_minutes', timedelta(days=2), timedelta(hours=12)),
+}
+
+# Connect/disconnect status messages, shared by both interfaces
+_CONNECTING_MSG = "Connecting to Rithmic as %s..."
+_CONNECTED_MSG = "✅ Successfully connected to Rithmic! (%.2fs)"
+_CONNECT_FAILED_MSG = "❌ Failed to connect to Rithmic: %s"
+_CONNECT_TIMEOUT_MSG = "❌ Connection to Rithmic timed out after %.0f seconds"
+_DISCONNECT_ERROR_MSG = "⚠️  Error during disconnect: %s"
+
+# Connect timeout per consecutive attempt; later attempts reuse the last value
+_TIMEOUT_SCHEDULE = (30.0, 45.0, 60.0)
+
+# Config gateway name -> async_rithmic gateway; unknown names fall back to TEST
+_GATEWAY_MAP = {
+    'Chicago': Gateway.CHICAGO,
+    'Test': Gateway.TEST,
+}
+
+async def ask_in_thread(prompt_func, *args, **kwargs):
+    """
+    Run a blocking prompt (input, Prompt.ask) without stalling the event loop.
+    
+    The prompt runs in a daemon thread so the Rithmic client's background
+    tasks keep running while waiting for the user, and an abandoned prompt
+    never blocks interpreter shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def _resolve(result=None, error=None):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    
+    def _worker():
+        try:
+            result = prompt_func(*args, **kwargs)
+        except Exception as e:
+            loop.call_soon_threadsafe(_resolve, None, e)
+        else:
+            loop.call_soon_threadsafe(_resolve, result)
+    
+    threading.Thread(target=_worker, name="prompt", daemon=True).start()
+    return await future
+
+# Front-month contracts only change at roll, so lookups are cached for an hour
+_FRONT_MONTH_TTL = 3600.0
+_FRONT_MONTH_CACHE_SIZE = 256
+_front_month_cache: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+
+def clear_front_month_cache():
+    """Forget cached front-month lookups, e.g. on a contract roll day"""
+    _front_month_cache.clear()
+
+async def get_front_month_contract(client: RithmicClient, symbol: str, exchange: str = "CME") -> Optional[str]:
+    """
+    Get the front month contract for a symbol root (e.g. 'ES' -> 'ESZ4')
+    
+    Results are cached per (symbol, exchange) for _FRONT_MONTH_TTL seconds,
+    keeping the _FRONT_MONTH_CACHE_SIZE most recently used entries; failed
+    or empty lookups are not cached.
+    """
+    key = (symbol, exchange)
+    cached = _front_month_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        _front_month_cache.move_to_end(key)
+        return cached[1]
+    
+    contract = await client.get_front_month_contract(symbol, exchange)
+    if contract:
+        _front_month_cache[key] = (time.monotonic() + _FRONT_MONTH_TTL, contract)
+        _front_month_cache.move_to_end(key)
+        if len(_front_month_cache) > _FRONT_MONTH_CACHE_SIZE:
+            _front_month_cache.popitem(last=False)
+    return contract
+
+async def get_front_month_contracts(client: RithmicClient, symbols: List[str],
+                                    exchange: str = "CME") -> Dict[str, str]:
+    """
+    Get front month contracts for several symbol roots at once
+    
+    Rithmic has no multi-symbol front-month request, so the lookups are
+    issued concurrently and cost one round trip of wall time in total.
+    Symbols whose lookup fails or returns nothing are left out.
+    """
+    results = await asyncio.gather(
+        *(get_front_month_contract(client, symbol, exchange) for symbol in symbols),
+        return_exceptions=True
+    )
+    
+    contracts = {}
+    for symbol, result in zip(symbols, results):
+        if isinstance(result, Exception):
+            logger.error("Error getting front month contract for %s: %s", symbol, result)
+        elif result:
+            contracts[symbol] = result
+    return contracts
+
+def bars_to_records(bars: List[dict], symbol: str, contract: str,
+                    exchange: str, exchange_code: str) -> List[dict]:
+    """
+    Convert Rithmic time bars into market_data rows
+    
+    Columns are filled and cast once over the whole batch with pandas rather
+    than building and converting every bar field by field. Bars with an
+    unparseable price or no timestamp are dropped in the same pass.
+    """
+    bars_df = pd.DataFrame(bars)
+    
+    def column(name, default):
+        if name in bars_df:
+            return bars_df[name]
+        return pd.Series(default, index=bars_df.index)
+    
+    def numeric(name, default):
+        return pd.to_numeric(column(name, default), errors='coerce')
+    
+    close = numeric('close', 0).astype('float64')
+    records = pd.DataFrame({
+        'timestamp': column('bar_end_datetime', datetime.now()),
+        'open': numeric('open', 0).astype('float64'),
+        'high': numeric('high', 0).astype('float64'),
+        'low': numeric('low', 0).astype('float64'),
+        'close': close,
+        'volume': numeric('volume', 0).fillna(0).astype('int64'),
+        'tick_count': numeric('tick_count', 1).fillna(1).astype('int64'),
+        'vwap': numeric('vwap', close).fillna(close).astype('float64'),
+    })
+    
+    valid = records.dropna(subset=['timestamp', 'open', 'high', 'low', 'close'])
+    if len(valid) < len(records):
+        logger.warning("Dropped %d of %d bars for %s with missing prices or timestamps",
+                       len(records) - len(valid), len(records), contract)
+        records = valid.copy()
+    
+    # Constant columns broadcast across the batch
+    records['symbol'] = symbol
+    records['contract'] = contract
+    records['exchange'] = exchange
+    records['exchange_code'] = exchange_code
+    records['bid'] = None
+    records['ask'] = None
+    records['spread'] = None
+    records['data_quality_score'] = 1.0
+    records['is_regular_hours'] = True
+    
+    # Chunks finish out of order; inserting in time order keeps writes in
+    # the newest hypertable chunk instead of hopping between chunk indexes
+    records = records.sort_values('timestamp', kind='stable')
+    
+    return records.to_dict('records')
+
+@dataclass(slots=True)
 class DownloadProgress:
     """Track download progress for each data type"""
     contract: str
@@ -53,13 +263,17 @@ class DownloadProgress:
     completed_chunks: int
     current_chunk_info: str
     total_records: int
-    start_time: datetime
+    start_time: float  # time.perf_counter() when the download started
     
     @property
     def progress_percent(self) -> float:
         if self.total_chunks == 0:
             return 0.0
         return (self.completed_chunks / self.total_chunks) * 100
+    
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.start_time
 
 @dataclass
 class SystemStatus:
@@ -84,7 +298,51 @@ class RithmicAdminTUI:
         self.console = Console() if RICH_AVAILABLE else None
         self.status = SystemStatus()
         self.rithmic_client: Optional[RithmicClient] = None
+        self._client_kwargs: Optional[Dict[str, Any]] = None
+        self._connect_lock = asyncio.Lock()
+        self._connection_attempts = 0
+        self.max_concurrent_downloads = 8
         
+        # Menu key -> action; '0' (exit) is handled by run() itself
+        self._menu_actions = {
+            "1": self._menu_test_connections,
+            "2": self._menu_search_symbols,
+            "3": self._menu_download_historical_data,
+            "4": self._menu_view_data,
+            "5": self._menu_initialize_database,
+        }
+        
+        # Static panels never change, so parse their markup once up front
+        if RICH_AVAILABLE:
+            self._header_panel = Panel(
+                Align.center(
+                    Text("RITHMIC DATA ADMIN TOOL", style="bold cyan"),
+                    vertical="middle"
+                ),
+                border_style="cyan"
+            )
+            self._menu_panel = Panel(Text.from_markup(MENU_TEXT), title="Options", border_style="yellow")
+            self._footer_panel = Panel(
+                Align.center("Use number keys to navigate • Press Ctrl+C to exit"),
+                border_style="dim"
+            )
+            self._layout = self._create_layout()
+        
+    def _create_layout(self) -> Layout:
+        """Create the main menu layout tree once; redraws only update its panels"""
+        layout = Layout()
+        layout.split_column(
+            Layout(self._header_panel, name="header", size=8),
+            Layout(name="body"),
+            Layout(self._footer_panel, name="footer", size=3)
+        )
+        layout["body"].split_column(
+            Layout(name="status", size=8),
+            Layout(name="progress", size=10, visible=False),
+            Layout(self._menu_panel, name="menu")
+        )
+        return layout
+    
     def create_status_panel(self) -> Panel:
         """Create status panel showing connection status"""
         if not RICH_AVAILABLE:
@@ -97,10 +355,11 @@ class RithmicAdminTUI:
         # Symbols and contracts
         symbols_text = ", ".join(self.status.current_symbols) if self.status.current_symbols else "None"
         
-        contracts_text = []
-        for symbol, contracts in self.status.available_contracts.items():
-            contracts_text.append(f"{symbol}: {', '.join(contracts[:2])}")  # Show first 2 contracts
-        contracts_display = " | ".join(contracts_text) if contracts_text else "None"
+        # Show first 2 contracts per symbol
+        contracts_display = " | ".join(
+            f"{symbol}: {', '.join(contracts[:2])}"
+            for symbol, contracts in self.status.available_contracts.items()
+        ) or "None"
         
         status_text = f"""Rithmic: {rithmic_status}
 Database: {db_status}
@@ -123,9 +382,10 @@ Contracts: {contracts_display}"""
         table.add_column("Records", style="red")
         table.add_column("Current Chunk", style="white")
         
-        for key, progress in self.status.download_progress.items():
-            progress_bar = f"[{'█' * int(progress.progress_percent / 5)}{'░' * (20 - int(progress.progress_percent / 5))}]"
-            progress_text = f"{progress_bar} {progress.progress_percent:.1f}%"
+        # Sorted by key so rows keep their position however the dict was filled
+        for key, progress in sorted(self.status.download_progress.items()):
+            percent = progress.progress_percent
+            progress_text = f"{PROGRESS_BARS[min(int(percent / 5), 20)]} {percent:.1f}%"
             
             table.add_row(
                 progress.contract,
@@ -143,163 +403,180 @@ Contracts: {contracts_display}"""
         if RICH_AVAILABLE:
             self.console.clear()
             
-            # Create layout
-            layout = Layout()
-            layout.split_column(
-                Layout(name="header", size=8),
-                Layout(name="body"),
-                Layout(name="footer", size=3)
-            )
-            
-            # Header with title
-            layout["header"].update(
-                Panel(
-                    Align.center(
-                        Text("RITHMIC DATA ADMIN TOOL", style="bold cyan"),
-                        vertical="middle"
-                    ),
-                    border_style="cyan"
-                )
-            )
+            # Only the dynamic panels change between redraws
+            layout = self._layout
+            layout["status"].update(self.create_status_panel())
             
-            # Body with status and menu
-            status_panel = self.create_status_panel()
             progress_panel = self.create_progress_panel()
-            
-            menu_text = """[bold yellow]Main Menu[/bold yellow]
-
-[bold cyan]1.[/bold cyan] Test Connections (DB + Rithmic)
-[bold cyan]2.[/bold cyan] Search Symbols & Check Contracts  
-[bold cyan]3.[/bold cyan] Download Historical Data
-[bold cyan]4.[/bold cyan] View TimescaleDB Data
-[bold cyan]5.[/bold cyan] Initialize/Setup Database
-[bold cyan]0.[/bold cyan] Exit"""
-            
-            menu_panel = Panel(menu_text, title="Options", border_style="yellow")
-            
             if progress_panel:
-                layout["body"].split_column(
-                    Layout(status_panel, size=8),
-                    Layout(progress_panel, size=10),
-                    Layout(menu_panel)
-                )
-            else:
-                layout["body"].split_column(
-                    Layout(status_panel, size=8),
-                    Layout(menu_panel)
-                )
-            
-            # Footer
-            layout["footer"].update(
-                Panel(
-                    Align.center("Use number keys to navigate • Press Ctrl+C to exit"),
-                    border_style="dim"
-                )
-            )
+                layout["progress"].update(progress_panel)
+            layout["progress"].visible = progress_panel is not None
             
             self.console.print(layout)
         else:
-            # Fallback for no Rich
-            print("\n" + "="*60)
-            print("RITHMIC DATA ADMIN TOOL".center(60))
-            print("="*60)
-            print(f"Rithmic: {'Connected' if self.status.rithmic_connected else 'Disconnected'}")
-            print(f"Database: {'Connected' if self.status.db_connected else 'Disconnected'}")
-            print("-"*60)
-            print("1. Test Connections (DB + Rithmic)")
-            print("2. Search Symbols & Check Contracts")
-            print("3. Download Historical Data")
-            print("4. View TimescaleDB Data")
-            print("5. Initialize/Setup Database")
-            print("0. Exit")
-            print("-"*60)
+            # Fallback for no Rich: build the whole screen, then write it once
+            lines = [
+                "",
+                "="*60,
+                "RITHMIC DATA ADMIN TOOL".center(60),
+                "="*60,
+                f"Rithmic: {'Connected' if self.status.rithmic_connected else 'Disconnected'}",
+                f"Database: {'Connected' if self.status.db_connected else 'Disconnected'}",
+                "-"*60,
+                *PLAIN_MENU_LINES,
+                "-"*60,
+            ]
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
 
     async def test_connections(self):
         """Test database and Rithmic connections"""
+        # The probes are independent, so run them side by side
         if RICH_AVAILABLE:
-            with self.console.status("[bold green]Testing connections...") as status:
-                # Test database
-                status.update("[bold blue]Testing TimescaleDB connection...")
-                try:
-                    db_manager = get_database_manager()
-                    connection_ok = await db_manager.test_connection()
-                    if connection_ok:
-                        self.console.print("✅ TimescaleDB connection successful", style="green")
-                        self.status.db_connected = True
-                        
-                        # Verify tables exist
-                        async with get_async_session() as session:
-                            from sqlalchemy import text
-                            result = await session.execute(text("SELECT COUNT(*) FROM market_data_seconds LIMIT 1"))
-                            self.console.print("✅ TimescaleDB tables accessible", style="green")
-                    else:
-                        self.console.print("❌ TimescaleDB connection failed", style="red")
-                        self.status.db_connected = False
-                except Exception as e:
-                    self.console.print(f"❌ TimescaleDB connection error: {e}", style="red")
-                    self.status.db_connected = False
-                
-                # Test Rithmic
-                status.update("[bold blue]Testing Rithmic connection...")
-                await self.connect_to_rithmic()
+            with self.console.status("[bold blue]Testing TimescaleDB and Rithmic connections..."):
+                await asyncio.gather(self._probe_db(), self.connect_to_rithmic())
         else:
             print("Testing connections...")
-            # Fallback implementation
-            await self.connect_to_rithmic()
+            await asyncio.gather(self._probe_db(), self.connect_to_rithmic())
     
-    async def connect_to_rithmic(self) -> bool:
-        """Connect to Rithmic API"""
+    async def _probe_db(self) -> bool:
+        """Test the TimescaleDB connection and table access"""
         try:
-            config = get_chicago_gateway_config()
-            
+            db_manager = get_database_manager()
+            connection_ok = await db_manager.test_connection()
+            if connection_ok:
+                if RICH_AVAILABLE:
+                    self.console.print("✅ TimescaleDB connection successful", style="green")
+                else:
+                    print("✅ TimescaleDB connection successful")
+                self.status.db_connected = True
+                
+                # Verify tables exist
+                async with get_async_session() as session:
+                    # SELECT 1 stops at the first row instead of counting the hypertable
+                    await session.execute(text("SELECT 1 FROM market_data_seconds LIMIT 1"))
+                    if RICH_AVAILABLE:
+                        self.console.print("✅ TimescaleDB tables accessible", style="green")
+                    else:
+                        print("✅ TimescaleDB tables accessible")
+            else:
+                if RICH_AVAILABLE:
+                    self.console.print("❌ TimescaleDB connection failed", style="red")
+                else:
+                    print("❌ TimescaleDB connection failed")
+                self.status.db_connected = False
+        except Exception as e:
             if RICH_AVAILABLE:
-                self.console.print(f"Connecting to Rithmic as {config['rithmic']['user']}...", style="blue")
-            
-            reconnection = ReconnectionSettings(
-                max_retries=3,
-                backoff_type="exponential",
-                interval=2,
-                max_delay=30,
-                jitter_range=(0.5, 1.5)
-            )
-            
-            retry = RetrySettings(
-                max_retries=2,
-                timeout=20.0,
-                jitter_range=(0.5, 1.5)
-            )
-            
-            gateway_name = config['rithmic']['gateway']
-            gateway = Gateway.CHICAGO if gateway_name == 'Chicago' else Gateway.TEST
-            
-            self.rithmic_client = RithmicClient(
-                user=config['rithmic']['user'],
-                password=config['rithmic']['password'],
-                system_name=config['rithmic']['system_name'],
-                app_name=config['rithmic']['app_name'],
-                app_version=config['rithmic']['app_version'],
-                gateway=gateway,
-                reconnection_settings=reconnection,
-                retry_settings=retry
-            )
+                self.console.print(f"❌ TimescaleDB connection error: {e}", style="red")
+            else:
+                print(f"❌ TimescaleDB connection error: {e}")
+            self.status.db_connected = False
+        return self.status.db_connected
+    
+    def _build_client_kwargs(self) -> Dict[str, Any]:
+        """Build the RithmicClient arguments from config (cached after first use)"""
+        if self._client_kwargs is None:
+            rithmic_config = get_chicago_gateway_config()['rithmic']
             
-            await self.rithmic_client.connect()
-            self.status.rithmic_connected = True
+            gateway_name = rithmic_config['gateway']
+            gateway = _GATEWAY_MAP.get(gateway_name)
+            if gateway is None:
+                logger.warning("Unknown Rithmic gateway %r, using the test gateway", gateway_name)
+                gateway = Gateway.TEST
             
+            self._client_kwargs = {
+                'user': rithmic_config['user'],
+                'password': rithmic_config['password'],
+                'system_name': rithmic_config['system_name'],
+                'app_name': rithmic_config['app_name'],
+                'app_version': rithmic_config['app_version'],
+                'gateway': gateway,
+                'reconnection_settings': ReconnectionSettings(
+                    max_retries=3,
+                    backoff_type="exponential",
+                    interval=2,
+                    max_delay=30,
+                    jitter_range=(0.5, 1.5)
+                ),
+                'retry_settings': RetrySettings(
+                    max_retries=2,
+                    timeout=20.0,
+                    jitter_range=(0.5, 1.5)
+                ),
+            }
+        return self._client_kwargs
+    
+    async def connect_to_rithmic(self) -> bool:
+        """Connect to Rithmic API"""
+        if self.status.rithmic_connected and self.rithmic_client is not None:
             if RICH_AVAILABLE:
-                self.console.print("✅ Successfully connected to Rithmic!", style="green")
+                self.console.print("✅ Already connected to Rithmic", style="green")
             else:
-                print("✅ Successfully connected to Rithmic!")
-            
+                print("✅ Already connected to Rithmic")
             return True
+        
+        # Serialize connects so concurrent callers share one login
+        async with self._connect_lock:
+            # Another caller may have connected while we waited for the lock
+            if self.status.rithmic_connected and self.rithmic_client is not None:
+                return True
             
+            try:
+                client_kwargs = self._build_client_kwargs()
+                
+                if RICH_AVAILABLE:
+                    self.console.print(_CONNECTING_MSG % client_kwargs['user'], style="blue")
+                
+                self._connection_attempts += 1
+                connection_start = time.monotonic()
+                # Client arguments are cached per instance, so an existing client
+                # is still configured correctly and can simply reconnect. Failed
+                # attempts discard their client, so any client kept here has
+                # connected successfully before
+                if self.rithmic_client is None:
+                    self.rithmic_client = RithmicClient(**client_kwargs)
+                
+                timeout = _TIMEOUT_SCHEDULE[min(self._connection_attempts, len(_TIMEOUT_SCHEDULE)) - 1]
+                await asyncio.wait_for(self.rithmic_client.connect(), timeout=timeout)
+                self.status.rithmic_connected = True
+                self._connection_attempts = 0
+                connection_duration = time.monotonic() - connection_start
+                
+                if RICH_AVAILABLE:
+                    self.console.print(_CONNECTED_MSG % connection_duration, style="green")
+                else:
+                    print(_CONNECTED_MSG % connection_duration)
+                
+                return True
+                
+            except asyncio.TimeoutError:
+                self.status.rithmic_connected = False
+                await self._discard_client()
+                if RICH_AVAILABLE:
+                    self.console.print(_CONNECT_TIMEOUT_MSG % timeout, style="red")
+                else:
+                    print(_CONNECT_TIMEOUT_MSG % timeout)
+                return False
+            except Exception as e:
+                self.status.rithmic_connected = False
+                await self._discard_client()
+                if RICH_AVAILABLE:
+                    self.console.print(_CONNECT_FAILED_MSG % e, style="red")
+                else:
+                    print(_CONNECT_FAILED_MSG % e)
+                return False
+
+    async def _discard_client(self, timeout: float = 5.0):
+        """Tear down a client whose connect failed or was cancelled part-way"""
+        client, self.rithmic_client = self.rithmic_client, None
+        if client is None:
+            return
+        try:
+            # Closes any plant connections the interrupted login left open
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stderr(devnull):
+                await asyncio.wait_for(client.disconnect(), timeout=timeout)
         except Exception as e:
-            self.status.rithmic_connected = False
-            if RICH_AVAILABLE:
-                self.console.print(f"❌ Failed to connect to Rithmic: {e}", style="red")
-            else:
-                print(f"❌ Failed to connect to Rithmic: {e}")
-            return False
+            logger.debug("Ignoring error while discarding Rithmic client: %r", e)
 
     async def download_historical_data_with_progress(self, days: int = 7):
         """Download historical data with enhanced progress tracking"""
@@ -315,7 +592,8 @@ Contracts: {contracts_display}"""
         
         # Ask for data types
         if RICH_AVAILABLE:
-            choice = Prompt.ask(
+            choice = await ask_in_thread(
+                Prompt.ask,
                 "Select data types",
                 choices=["1", "2", "3"],
                 default="1",
@@ -325,7 +603,7 @@ Contracts: {contracts_display}"""
             print("1. Second bars")
             print("2. Minute bars") 
             print("3. Both")
-            choice = input("Enter choice (default: 1): ") or "1"
+            choice = await ask_in_thread(input, "Enter choice (default: 1): ") or "1"
         
         download_second_bars = choice in ['1', '3']
         download_minute_bars = choice in ['2', '3']
@@ -350,27 +628,31 @@ Contracts: {contracts_display}"""
                 
                 main_task = progress.add_task("Overall Progress", total=total_contracts)
                 
+                # All contracts download at once; this semaphore alone
+                # bounds the number of in-flight Rithmic requests
+                semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
+                
+                async def download_contract(symbol: str, contract: str):
+                    downloads = []
+                    if download_second_bars:
+                        downloads.append(self._download_with_progress(
+                            semaphore, contract, symbol, start_time, end_time,
+                            "second", 1, progress, main_task
+                        ))
+                    if download_minute_bars:
+                        downloads.append(self._download_with_progress(
+                            semaphore, contract, symbol, start_time, end_time,
+                            "minute", 1, progress, main_task
+                        ))
+                    await asyncio.gather(*downloads)
+                    progress.advance(main_task)
+                
                 try:
-                    async with get_async_session() as session:
-                        helper = TimescaleDBHelper(session)
-                        
-                        for symbol, contracts in self.status.available_contracts.items():
-                            for contract in contracts:
-                                
-                                if download_second_bars:
-                                    await self._download_with_progress(
-                                        helper, contract, symbol, start_time, end_time,
-                                        "second", TimeBarType.SECOND_BAR, 1, progress, main_task
-                                    )
-                                
-                                if download_minute_bars:
-                                    await self._download_with_progress(
-                                        helper, contract, symbol, start_time, end_time,
-                                        "minute", TimeBarType.MINUTE_BAR, 1, progress, main_task
-                                    )
-                                
-                                progress.advance(main_task)
-                                
+                    await asyncio.gather(*(
+                        download_contract(symbol, contract)
+                        for symbol, contracts in self.status.available_contracts.items()
+                        for contract in contracts
+                    ))
                 except Exception as e:
                     self.console.print(f"❌ Download failed: {e}", style="red")
                     logger.exception("Download failed")
@@ -380,140 +662,162 @@ Contracts: {contracts_display}"""
             # Implement basic download without progress bars
             
         # Verify data was inserted
-        await self._verify_data_insertion()
+        await self._verify_data_insertion(
+            [contract for contracts in self.status.available_contracts.values() for contract in contracts],
+            start_time
+        )
 
-    async def _download_with_progress(self, helper: TimescaleDBHelper, contract: str, symbol: str, 
+    async def _download_with_progress(self, semaphore: asyncio.Semaphore, contract: str, symbol: str, 
                                      start_time: datetime, end_time: datetime, data_type: str,
-                                     bar_type: TimeBarType, interval: int, progress: Progress, main_task: TaskID):
+                                     interval: int, progress: Progress, main_task: TaskID):
         """Download data with detailed progress tracking"""
         
         progress_key = f"{contract}_{data_type}"
+        bar_type, table_name, chunk_interval, min_chunk_interval = DATA_TYPE_CONFIG[data_type]
         
-        # Estimate chunks based on time range and data type
-        time_diff = end_time - start_time
-        if data_type == "second":
-            max_chunk_hours = 6
-            estimated_chunks = max(1, int(time_diff.total_seconds() / (max_chunk_hours * 3600)))
-        else:
-            max_chunk_days = 2  
-            estimated_chunks = max(1, int(time_diff.days / max_chunk_days))
+        chunk_count = max(0, math.ceil((end_time - start_time) / chunk_interval))
+        chunk_starts = [start_time + chunk_interval * i for i in range(chunk_count)]
+        time_chunks = [
+            (chunk_start, min(end_time, chunk_start + chunk_interval))
+            for chunk_start in chunk_starts
+        ]
         
         # Initialize progress tracking
-        self.status.download_progress[progress_key] = DownloadProgress(
+        download = DownloadProgress(
             contract=contract,
             data_type=data_type,
-            total_chunks=estimated_chunks,
+            total_chunks=len(time_chunks),
             completed_chunks=0,
             current_chunk_info="Starting...",
             total_records=0,
-            start_time=datetime.now()
+            start_time=time.perf_counter()
         )
+        self.status.download_progress[progress_key] = download
         
-        task = progress.add_task(f"{contract} {data_type}", total=estimated_chunks)
+        task = progress.add_task(f"{contract} {data_type}", total=len(time_chunks))
+        exchange = self.status.current_exchange
+        exchange_code = _EXCHANGE_CODES.get(exchange, exchange)
         
-        try:
-            all_bars = []
-            current_start = start_time
-            completed_chunks = 0
-            
-            if data_type == "second":
-                max_chunk_hours = 6
-                chunk_interval = timedelta(hours=max_chunk_hours)
-            else:
-                max_chunk_days = 2
-                chunk_interval = timedelta(days=max_chunk_days)
-            
-            while current_start < end_time:
-                current_end = min(end_time, current_start + chunk_interval)
-                
-                # Update progress with current chunk info
-                chunk_info = f"{current_start.strftime('%m/%d %H:%M')} to {current_end.strftime('%m/%d %H:%M')}"
-                self.status.download_progress[progress_key].current_chunk_info = chunk_info
-                progress.update(task, description=f"{contract} {data_type} - {chunk_info}")
-                
+        # Chunks download concurrently (bounded by the shared semaphore) and
+        # hand their bars to a single writer, so inserts overlap with downloads
+        bar_queue: asyncio.Queue = asyncio.Queue(maxsize=BAR_QUEUE_SIZE)
+        
+        async def fetch_chunk(chunk_start: datetime, chunk_end: datetime):
+            chunk_info = f"{chunk_start.strftime('%m/%d %H:%M')} to {chunk_end.strftime('%m/%d %H:%M')}"
+            chunk_bars = None
+            for attempt, timeout in enumerate(CHUNK_TIMEOUTS, 1):
+                if attempt > 1:
+                    # Back off outside the semaphore so other chunks keep going
+                    await asyncio.sleep(2 ** (attempt - 2))
                 try:
-                    chunk_bars = await self.rithmic_client.get_historical_time_bars(
-                        contract,
-                        self.status.current_exchange,
-                        current_start,
-                        current_end,
-                        bar_type,
-                        interval
-                    )
-                    
-                    if chunk_bars:
-                        all_bars.extend(chunk_bars)
-                        self.status.download_progress[progress_key].total_records += len(chunk_bars)
-                    
-                    completed_chunks += 1
-                    self.status.download_progress[progress_key].completed_chunks = completed_chunks
-                    progress.advance(task)
-                    
-                    # If we hit API limit, reduce chunk size
-                    if len(chunk_bars) >= 9999:
-                        if data_type == "second" and max_chunk_hours > 1:
-                            max_chunk_hours = max_chunk_hours / 2
-                            chunk_interval = timedelta(hours=max_chunk_hours)
-                        elif data_type == "minute" and max_chunk_days > 0.5:
-                            max_chunk_days = max_chunk_days / 2
-                            chunk_interval = timedelta(days=max_chunk_days)
-                    
+                    async with semaphore:
+                        download.current_chunk_info = chunk_info
+                        progress.update(task, description=f"{contract} {data_type} - {chunk_info}")
+                        chunk_bars = await asyncio.wait_for(
+                            self.rithmic_client.get_historical_time_bars(
+                                contract,
+                                exchange,
+                                chunk_start,
+                                chunk_end,
+                                bar_type,
+                                interval
+                            ),
+                            timeout=timeout
+                        )
+                    break
                 except Exception as e:
-                    logger.error(f"Error fetching chunk for {contract}: {e}")
-                    progress.advance(task)
-                    completed_chunks += 1
-                
-                current_start = current_end
+                    logger.warning("Attempt %d/%d for %s chunk %s failed: %r",
+                                   attempt, len(CHUNK_TIMEOUTS), contract, chunk_info, e)
+            else:
+                logger.error("Error fetching chunk for %s: giving up on %s", contract, chunk_info)
             
-            # Save to database if we have data
-            if all_bars:
-                self.status.download_progress[progress_key].current_chunk_info = "Saving to database..."
-                progress.update(task, description=f"{contract} {data_type} - Saving to DB...")
-                
-                data_records = []
-                for bar in all_bars:
-                    record = {
-                        'timestamp': bar.get('bar_end_datetime', datetime.now()),
-                        'symbol': symbol,
-                        'contract': contract,
-                        'exchange': self.status.current_exchange,
-                        'exchange_code': 'XCME' if self.status.current_exchange == 'CME' else self.status.current_exchange,
-                        'open': float(bar.get('open', 0)),
-                        'high': float(bar.get('high', 0)),
-                        'low': float(bar.get('low', 0)),
-                        'close': float(bar.get('close', 0)),
-                        'volume': bar.get('volume', 0),
-                        'tick_count': bar.get('tick_count', 1),
-                        'vwap': float(bar.get('vwap', bar.get('close', 0))),
-                        'bid': None,
-                        'ask': None,
-                        'spread': None,
-                        'data_quality_score': 1.0,
-                        'is_regular_hours': True
-                    }
-                    data_records.append(record)
-                
-                table_name = 'market_data_seconds' if data_type == 'second' else 'market_data_minutes'
-                await helper.bulk_insert_market_data(data_records, table_name)
-                
-                self.status.download_progress[progress_key].current_chunk_info = f"Saved {len(data_records):,} records"
+            # Hitting the API limit means the chunk was truncated; refetch it as two halves
+            if chunk_bars and len(chunk_bars) >= 9999 and chunk_end - chunk_start > min_chunk_interval:
+                midpoint = chunk_start + (chunk_end - chunk_start) / 2
+                download.total_chunks += 1
+                progress.update(task, total=download.total_chunks)
+                await asyncio.gather(fetch_chunk(chunk_start, midpoint), fetch_chunk(midpoint, chunk_end))
+                return
+            
+            if chunk_bars:
+                download.total_records += len(chunk_bars)
+                await bar_queue.put(chunk_bars)
+            
+            download.completed_chunks += 1
+            progress.advance(task)
+        
+        async def save_bars() -> int:
+            saved = 0
+            pending = []
+            # Each download has its own session since downloads run concurrently
+            async with get_async_session() as session:
+                helper = TimescaleDBHelper(session)
+                while True:
+                    chunk_bars = await bar_queue.get()
+                    if chunk_bars is not None:
+                        pending.extend(chunk_bars)
+                    if pending and (chunk_bars is None or len(pending) >= INSERT_BATCH_SIZE):
+                        data_records = bars_to_records(pending, symbol, contract, exchange, exchange_code)
+                        # Count what actually landed, not rows skipped as bad or duplicate
+                        saved += await helper.bulk_insert_market_data(data_records, table_name)
+                        pending = []
+                    if chunk_bars is None:
+                        return saved
+        
+        async def fetch_all_chunks():
+            await asyncio.gather(*(fetch_chunk(chunk_start, chunk_end) for chunk_start, chunk_end in time_chunks))
+        
+        writer = asyncio.create_task(save_bars())
+        downloads = asyncio.create_task(fetch_all_chunks())
+        sentinel = None
+        try:
+            # If the writer dies, every put on the full queue would block
+            # forever, so race both the downloads and the end-of-stream
+            # sentinel against it
+            await asyncio.wait((writer, downloads), return_when=asyncio.FIRST_COMPLETED)
+            if writer.done():
+                await writer
+            await downloads
+            sentinel = asyncio.create_task(bar_queue.put(None))
+            await asyncio.wait((writer, sentinel), return_when=asyncio.FIRST_COMPLETED)
+            if writer.done():
+                await writer
+            
+            download.current_chunk_info = "Saving to database..."
+            progress.update(task, description=f"{contract} {data_type} - Saving to DB...")
+            
+            saved = await writer
+            download.current_chunk_info = f"Saved {saved:,} records in {download.elapsed_seconds:.1f}s"
                 
         except Exception as e:
-            logger.error(f"Error downloading {data_type} bars for {contract}: {e}")
-            self.status.download_progress[progress_key].current_chunk_info = f"Error: {str(e)[:50]}..."
+            logger.error("Error downloading %s bars for %s: %s", data_type, contract, e)
+            download.current_chunk_info = f"Error: {str(e)[:50]}..."
+        finally:
+            # No-ops once they have finished
+            downloads.cancel()
+            writer.cancel()
+            if sentinel is not None:
+                sentinel.cancel()
 
-    async def _verify_data_insertion(self):
+    async def _verify_data_insertion(self, contracts: List[str], start_time: datetime):
         """Verify data was actually inserted into the database"""
+        # Count only the downloaded contracts and window, which the
+        # (contract, timestamp) indexes answer without scanning every chunk
+        params = {'contracts': contracts, 'start_time': start_time}
         try:
             async with get_async_session() as session:
-                from sqlalchemy import text
-                
                 # Check second data
-                result = await session.execute(text("SELECT COUNT(*) FROM market_data_seconds"))
+                result = await session.execute(text(
+                    "SELECT COUNT(*) FROM market_data_seconds "
+                    "WHERE contract = ANY(:contracts) AND timestamp >= :start_time"
+                ), params)
                 second_count = result.scalar()
                 
                 # Check minute data
-                result = await session.execute(text("SELECT COUNT(*) FROM market_data_minutes"))
+                result = await session.execute(text(
+                    "SELECT COUNT(*) FROM market_data_minutes "
+                    "WHERE contract = ANY(:contracts) AND timestamp >= :start_time"
+                ), params)
                 minute_count = result.scalar()
                 
                 if RICH_AVAILABLE:
@@ -527,17 +831,55 @@ Contracts: {contracts_display}"""
                     self.console.print(table)
                     
                     if second_count == 0 and minute_count == 0:
-                        self.console.print("⚠️  No data found in database! Check logs for errors.", style="yellow")
+                        self.console.print("⚠️  No data found for the downloaded contracts! Check logs for errors.", style="yellow")
                 else:
                     print(f"Database verification:")
                     print(f"Second data: {second_count:,} records")
                     print(f"Minute data: {minute_count:,} records")
                     
         except Exception as e:
-            logger.error(f"Error verifying data insertion: {e}")
+            logger.error("Error verifying data insertion: %s", e)
             if RICH_AVAILABLE:
                 self.console.print(f"❌ Error verifying data: {e}", style="red")
 
+    async def _menu_test_connections(self):
+        """Menu 1: test database and Rithmic connections"""
+        await self.test_connections()
+        if not RICH_AVAILABLE:
+            await ask_in_thread(input, "\nPress Enter to continue...")
+    
+    async def _menu_search_symbols(self):
+        """Menu 2: search symbols and check contracts"""
+        # Search symbols implementation
+        if RICH_AVAILABLE:
+            self.console.print("🔍 Symbol search not yet implemented in TUI version", style="yellow")
+        else:
+            print("Symbol search not yet implemented")
+    
+    async def _menu_download_historical_data(self):
+        """Menu 3: download historical data"""
+        if RICH_AVAILABLE:
+            days = int(await ask_in_thread(Prompt.ask, "Enter number of days to download", default="7"))
+        else:
+            days = int(await ask_in_thread(input, "Enter number of days to download (default: 7): ") or "7")
+        await self.download_historical_data_with_progress(days)
+    
+    async def _menu_view_data(self):
+        """Menu 4: view TimescaleDB data"""
+        # View database data
+        if RICH_AVAILABLE:
+            self.console.print("📊 Database viewer not yet implemented in TUI version", style="yellow")
+        else:
+            print("Database viewer not yet implemented")
+    
+    async def _menu_initialize_database(self):
+        """Menu 5: initialize/setup database"""
+        # Initialize database
+        if RICH_AVAILABLE:
+            self.console.print("🔧 Database initialization not yet implemented in TUI version", style="yellow")
+        else:
+            print("Database initialization not yet implemented")
+
     async def run(self):
         """Main application loop"""
         try:
@@ -545,44 +887,16 @@ Contracts: {contracts_display}"""
                 self.display_main_menu()
                 
                 if RICH_AVAILABLE:
-                    choice = Prompt.ask("Enter your choice", choices=["0", "1", "2", "3", "4", "5"])
+                    choice = await ask_in_thread(Prompt.ask, "Enter your choice", choices=MENU_CHOICES)
                 else:
-                    choice = input("\nEnter your choice: ")
+                    choice = await ask_in_thread(input, "\nEnter your choice: ")
                 
-                if choice == '1':
-                    await self.test_connections()
-                    if not RICH_AVAILABLE:
-                        input("\nPress Enter to continue...")
-                elif choice == '2':
-                    # Search symbols implementation
-                    if RICH_AVAILABLE:
-                        self.console.print("🔍 Symbol search not yet implemented in TUI version", style="yellow")
-                    else:
-                        print("Symbol search not yet implemented")
-                elif choice == '3':
-                    if RICH_AVAILABLE:
-                        days = int(Prompt.ask("Enter number of days to download", default="7"))
-                    else:
-                        days = int(input("Enter number of days to download (default: 7): ") or "7")
-                    await self.download_historical_data_with_progress(days)
-                elif choice == '4':
-                    # View database data
-                    if RICH_AVAILABLE:
-                        self.console.print("📊 Database viewer not yet implemented in TUI version", style="yellow")
-                    else:
-                        print("Database viewer not yet implemented")
-                elif choice == '5':
-                    # Initialize database
-                    if RICH_AVAILABLE:
-                        self.console.print("🔧 Database initialization not yet implemented in TUI version", style="yellow")
-                    else:
-                        print("Database initialization not yet implemented")
-                elif choice == '0':
-                    if self.rithmic_client and self.status.rithmic_connected:
-                        if RICH_AVAILABLE:
-                            self.console.print("Disconnecting from Rithmic...", style="yellow")
-                        await self.disconnect_from_rithmic()
+                if choice == '0':
                     break
+                
+                action = self._menu_actions.get(choice)
+                if action is not None:
+                    await action()
                 else:
                     if RICH_AVAILABLE:
                         self.console.print("Invalid choice. Please try again.", style="red")
@@ -590,9 +904,10 @@ Contracts: {contracts_display}"""
                         print("Invalid choice. Please try again.")
                 
                 if RICH_AVAILABLE:
-                    input("\nPress Enter to continue...")
+                    await ask_in_thread(input, "\nPress Enter to continue...")
                 
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            # asyncio.run() turns Ctrl+C into cancellation of this task
             if RICH_AVAILABLE:
                 self.console.print("\n👋 Goodbye!", style="yellow")
             else:
@@ -603,23 +918,19 @@ Contracts: {contracts_display}"""
                 self.console.print(f"❌ Unhandled exception: {e}", style="red")
             else:
                 print(f"Unhandled exception: {e}")
+        finally:
+            if self.rithmic_client and self.status.rithmic_connected:
+                if RICH_AVAILABLE:
+                    self.console.print("Disconnecting from Rithmic...", style="yellow")
+                await self.disconnect_from_rithmic()
 
     async def disconnect_from_rithmic(self, timeout=5.0):
         """Disconnect from Rithmic with timeout"""
         if self.rithmic_client and self.status.rithmic_connected:
             try:
-                import sys
-                from io import StringIO
-                
-                # Capture stderr to suppress disconnect warnings
-                original_stderr = sys.stderr
-                string_buffer = StringIO()
-                
-                try:
-                    sys.stderr = string_buffer
+                # Discard stderr to suppress disconnect warnings
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stderr(devnull):
                     await asyncio.wait_for(self.rithmic_client.disconnect(), timeout=timeout)
-                finally:
-                    sys.stderr = original_stderr
                     
                 if RICH_AVAILABLE:
                     self.console.print("✅ Rithmic connection closed successfully", style="green")
@@ -629,7 +940,7 @@ Contracts: {contracts_display}"""
                     self.console.print("⚠️  Disconnect timed out (expected behavior)", style="yellow")
             except Exception as e:
                 if RICH_AVAILABLE:
-                    self.console.print(f"⚠️  Error during disconnect: {e}", style="yellow")
+                    self.console.print(_DISCONNECT_ERROR_MSG % e, style="yellow")
             finally:
                 self.status.rithmic_connected = False
 
@@ -643,6 +954,8 @@ async def main():
     await app.run()
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -4,6 +4,7 @@
 Admin script for Rithmic data collection with interactive menu
 """
 import os
+import shutil
 import time
 import asyncio
 import logging
@@ -54,47 +55,53 @@ def clear_screen():
 def print_header():
     """Print the admin script header with current state"""
     clear_screen()
-    print(f"{Fore.CYAN}{'=' * 80}")
-    print(f"{Fore.YELLOW}{'RITHMIC DATA ADMIN TOOL':^80}")
-    print(f"{Fore.CYAN}{'=' * 80}{Style.RESET_ALL}")
+    
+    # Build the whole header first and write it once, rather than one
+    # console write per line
+    lines = [
+        f"{Fore.CYAN}{'=' * 80}",
+        f"{Fore.YELLOW}{'RITHMIC DATA ADMIN TOOL':^80}",
+        f"{Fore.CYAN}{'=' * 80}{Style.RESET_ALL}",
+    ]
     
     # Connection status
     if is_connected:
-        print(f"{Fore.GREEN}Rithmic Connection: Connected{Style.RESET_ALL}")
+        lines.append(f"{Fore.GREEN}Rithmic Connection: Connected{Style.RESET_ALL}")
     else:
-        print(f"{Fore.RED}Rithmic Connection: Disconnected{Style.RESET_ALL}")
+        lines.append(f"{Fore.RED}Rithmic Connection: Disconnected{Style.RESET_ALL}")
         
     # Database connection status
     if db_connected:
-        print(f"{Fore.GREEN}Database Connection: Connected{Style.RESET_ALL}")
+        lines.append(f"{Fore.GREEN}Database Connection: Connected{Style.RESET_ALL}")
     else:
-        print(f"{Fore.RED}Database Connection: Disconnected{Style.RESET_ALL}")
+        lines.append(f"{Fore.RED}Database Connection: Disconnected{Style.RESET_ALL}")
     
     # Current symbols and exchange
     if current_symbols:
-        print(f"{Fore.WHITE}Symbols: {', '.join(current_symbols)}")
+        lines.append(f"{Fore.WHITE}Symbols: {', '.join(current_symbols)}")
     else:
-        print(f"{Fore.WHITE}Symbols: None")
+        lines.append(f"{Fore.WHITE}Symbols: None")
     
-    print(f"Exchange: {current_exchange}")
+    lines.append(f"Exchange: {current_exchange}")
     
     # Available contracts
     if available_contracts:
         contract_str = []
         for symbol, contracts in available_contracts.items():
             contract_str.append(f"{symbol}: {', '.join(contracts)}")
-        print(f"Contracts: {' | '.join(contract_str)}")
+        lines.append(f"Contracts: {' | '.join(contract_str)}")
     else:
-        print("Contracts: None")
+        lines.append("Contracts: None")
     
     # Download progress
     if download_progress:
-        print("\nDownload Progress:")
+        lines.append("\nDownload Progress:")
         for symbol, progress in download_progress.items():
             progress_bar = "#" * int(progress * 30) + "." * (30 - int(progress * 30))
-            print(f"{symbol}: [{progress_bar}] {progress*100:.1f}%")
+            lines.append(f"{symbol}: [{progress_bar}] {progress*100:.1f}%")
     
-    print(f"{Fore.CYAN}{'-' * 80}{Style.RESET_ALL}\n")
+    lines.append(f"{Fore.CYAN}{'-' * 80}{Style.RESET_ALL}\n")
+    print("\n".join(lines), flush=True)
 
 def create_database():
     """Create SQLite database and tables if they don't exist"""
@@ -495,6 +502,49 @@ async def check_contracts():
     
     input("\nPress Enter to continue...")
 
+async def download_bars(conn, cursor, contract, contract_id, start_time, end_time,
+                        bar_type, table_name, label):
+    """Download 1-unit time bars for a contract and store them in table_name"""
+    print_header()  # Update progress display
+    print(f"  Downloading {label} bars for {contract}...")
+    
+    try:
+        try:
+            bars = await rithmic_client.get_historical_time_bars(
+                contract,
+                current_exchange,
+                start_time,
+                end_time,
+                bar_type,
+                1  # 1-second or 1-minute bars
+            )
+        except AttributeError:
+            print(f"{Fore.RED}Error: The get_historical_time_bars method is not available in this version of RithmicClient.{Style.RESET_ALL}")
+            bars = []
+        
+        print(f"  {Fore.GREEN}Received {len(bars)} {label} bars{Style.RESET_ALL}")
+        
+        # Save to database
+        for bar in bars:
+            cursor.execute(f"""
+                INSERT OR IGNORE INTO {table_name} 
+                (contract_id, timestamp, open, high, low, close, volume)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                contract_id,
+                bar['bar_end_datetime'].isoformat(),
+                bar['open'],
+                bar['high'],
+                bar['low'],
+                bar['close'],
+                bar['volume']
+            ))
+        
+        conn.commit()
+        
+    except Exception as e:
+        print(f"  {Fore.RED}Error downloading {label} bars: {e}{Style.RESET_ALL}")
+
 async def download_historical_data():
     """Download historical data for available contracts"""
     global download_progress
@@ -570,91 +620,14 @@ async def download_historical_data():
                 
                 contract_id = result[0]
                 
-                # Download second bars if requested
+                # Download second and/or minute bars as requested
                 if download_second_bars:
-                    print_header()  # Update progress display
-                    print(f"  Downloading second bars for {contract}...")
-                    
-                    try:
-                        try:
-                            second_bars = await rithmic_client.get_historical_time_bars(
-                                contract,
-                                current_exchange,
-                                start_time,
-                                end_time,
-                                TimeBarType.SECOND_BAR,
-                                1  # 1-second bars
-                            )
-                        except AttributeError:
-                            print(f"{Fore.RED}Error: The get_historical_time_bars method is not available in this version of RithmicClient.{Style.RESET_ALL}")
-                            second_bars = []
-                        
-                        print(f"  {Fore.GREEN}Received {len(second_bars)} second bars{Style.RESET_ALL}")
-                        
-                        # Save to database
-                        for bar in second_bars:
-                            cursor.execute("""
-                                INSERT OR IGNORE INTO second_bars 
-                                (contract_id, timestamp, open, high, low, close, volume)
-                                VALUES (?, ?, ?, ?, ?, ?, ?)
-                            """, (
-                                contract_id,
-                                bar['bar_end_datetime'].isoformat(),
-                                bar['open'],
-                                bar['high'],
-                                bar['low'],
-                                bar['close'],
-                                bar['volume']
-                            ))
-                        
-                        conn.commit()
-                        
-                    except Exception as e:
-                        print(f"  {Fore.RED}Error downloading second bars: {e}{Style.RESET_ALL}")
+                    await download_bars(conn, cursor, contract, contract_id, start_time, end_time,
+                                        TimeBarType.SECOND_BAR, 'second_bars', 'second')
                 
-                # Download minute bars if requested
                 if download_minute_bars:
-                    print_header()  # Update progress display
-                    print(f"  Downloading minute bars for {contract}...")
-                    
-                    try:
-                        try:
-                            minute_bars = await rithmic_client.get_historical_time_bars(
-                                contract,
-                                current_exchange,
-                                start_time,
-                                end_time,
-                                TimeBarType.MINUTE_BAR,
-                                1  # 1-minute bars
-                            )
-                        except AttributeError:
-                            print(f"{Fore.RED}Error: The get_historical_time_bars method is not available in this version of RithmicClient.{Style.RESET_ALL}")
-                            minute_bars = []
-                            1  # 1-minute bars
-                        )
-                        
-                        print(f"  {Fore.GREEN}Received {len(minute_bars)} minute bars{Style.RESET_ALL}")
-                        
-                        # Save to database
-                        for bar in minute_bars:
-                            cursor.execute("""
-                                INSERT OR IGNORE INTO minute_bars 
-                                (contract_id, timestamp, open, high, low, close, volume)
-                                VALUES (?, ?, ?, ?, ?, ?, ?)
-                            """, (
-                                contract_id,
-                                bar['bar_end_datetime'].isoformat(),
-                                bar['open'],
-                                bar['high'],
-                                bar['low'],
-                                bar['close'],
-                                bar['volume']
-                            ))
-                        
-                        conn.commit()
-                        
-                    except Exception as e:
-                        print(f"  {Fore.RED}Error downloading minute bars: {e}{Style.RESET_ALL}")
+                    await download_bars(conn, cursor, contract, contract_id, start_time, end_time,
+                                        TimeBarType.MINUTE_BAR, 'minute_bars', 'minute')
                 
                 # Update progress
                 contracts_processed += 1
@@ -670,10 +643,9 @@ async def download_historical_data():
     
     input("\nPress Enter to continue...")
 
-async def handle_time_bar(data, contract_id):
-    """Handle incoming time bar data"""
+async def handle_time_bar(conn, data, contract_id):
+    """Handle incoming time bar data on the stream's open connection"""
     try:
-        conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
         
         # Determine which table to use based on bar type
@@ -700,7 +672,6 @@ async def handle_time_bar(data, contract_id):
         ))
         
         conn.commit()
-        conn.close()
         
     except Exception as e:
         logger.error(f"Error saving time bar: {e}")
@@ -736,8 +707,10 @@ async def stream_live_data():
         print(f"{Fore.RED}Invalid choice. Defaulting to second bars.{Style.RESET_ALL}")
         stream_second_bars = True
     
-    # Get contract IDs from database
+    # Get contract IDs from database; the connection stays open for the
+    # whole stream instead of reconnecting for every incoming bar
     contract_map = {}
+    conn = None
     try:
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
@@ -753,10 +726,10 @@ async def stream_live_data():
                 result = cursor.fetchone()
                 if result:
                     contract_map[contract] = result[0]
-        
-        conn.close()
     except Exception as e:
         print(f"{Fore.RED}Error getting contract IDs: {e}{Style.RESET_ALL}")
+        if conn:
+            conn.close()
         input("\nPress Enter to continue...")
         return
     
@@ -764,13 +737,17 @@ async def stream_live_data():
     async def time_bar_handler(data):
         contract = data['symbol']
         if contract in contract_map:
-            await handle_time_bar(data, contract_map[contract])
+            await handle_time_bar(conn, data, contract_map[contract])
             
-            # Update display
-            print_header()
-            print(f"{Fore.GREEN}Received bar: {contract} @ {data['bar_end_datetime']}{Style.RESET_ALL}")
-            print(f"O: {data['open']}, H: {data['high']}, L: {data['low']}, C: {data['close']}, V: {data['volume']}")
-            print("\nPress Ctrl+C to stop streaming...")
+            # Rewrite the status line in place instead of clearing and
+            # redrawing the whole screen for every bar. It must fit on one
+            # terminal row: a wrapped line leaves its first half behind
+            status = (
+                f"{contract} @ {data['bar_end_datetime']:%H:%M:%S} "
+                f"O: {data['open']} H: {data['high']} L: {data['low']} C: {data['close']} V: {data['volume']}"
+            )
+            status = status[:shutil.get_terminal_size().columns - 1]
+            print(f"\r{Fore.GREEN}{status}{Style.RESET_ALL}\033[K", end="", flush=True)
     
     rithmic_client.on_time_bar += time_bar_handler
     
@@ -823,6 +800,7 @@ async def stream_live_data():
         
         # Remove handler
         rithmic_client.on_time_bar -= time_bar_handler
+        conn.close()
     
     input("\nPress Enter to continue...")
 
@@ -880,5 +858,3 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"{Fore.RED}Unhandled exception: {e}{Style.RESET_ALL}")
         logger.exception("Unhandled exception in main")
- 
- 
@@ -3,10 +3,16 @@
 Configuration for connecting to Rithmic via Chicago Gateway
 """
 
+from functools import lru_cache
+
+@lru_cache(maxsize=1)
 def get_chicago_gateway_config():
     """
     Get configuration for Rithmic connection
     
+    The configuration is built once and shared by every caller, so treat
+    the returned dict as read-only.
+    
     Returns:
         dict: Configuration dictionary for Rithmic client
     """
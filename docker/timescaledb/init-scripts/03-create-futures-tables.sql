@@ -120,9 +120,11 @@ CREATE TABLE IF NOT EXISTS market_data_seconds (
     PRIMARY KEY (timestamp, symbol, contract, exchange)
 );
 
--- Create hypertable for time-series optimization (1-minute chunks)
+-- Create hypertable for time-series optimization (1-day chunks: large enough
+-- to avoid per-chunk planning overhead, small enough that the newest chunk's
+-- indexes stay in memory while inserting)
 SELECT create_hypertable('market_data_seconds', 'timestamp', 
-    chunk_time_interval => INTERVAL '1 minute',
+    chunk_time_interval => INTERVAL '1 day',
     if_not_exists => TRUE
 );
 
@@ -182,9 +184,9 @@ CREATE TABLE IF NOT EXISTS market_data_minutes (
     PRIMARY KEY (timestamp, symbol, contract, exchange)
 );
 
--- Create hypertable for minutes (1-hour chunks)
+-- Create hypertable for minutes (7-day chunks; 60x fewer rows than seconds)
 SELECT create_hypertable('market_data_minutes', 'timestamp', 
-    chunk_time_interval => INTERVAL '1 hour',
+    chunk_time_interval => INTERVAL '7 days',
     if_not_exists => TRUE
 );
 
@@ -338,6 +340,9 @@ CREATE INDEX IF NOT EXISTS idx_market_data_seconds_contract_time ON market_data_
 CREATE INDEX IF NOT EXISTS idx_market_data_seconds_exchange_time ON market_data_seconds (exchange, timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_market_data_seconds_volume ON market_data_seconds (volume DESC) WHERE volume > 0;
 
+-- Market data minutes indexes
+CREATE INDEX IF NOT EXISTS idx_market_data_minutes_contract_time ON market_data_minutes (contract, timestamp DESC);
+
 -- Raw tick data indexes (careful with size)
 CREATE INDEX IF NOT EXISTS idx_raw_tick_data_contract_time ON raw_tick_data (contract, timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_raw_tick_data_type ON raw_tick_data (tick_type, timestamp DESC);
@@ -649,9 +654,31 @@ SELECT add_retention_policy('predictions', INTERVAL '6 months');
 -- COMPRESSION POLICIES
 -- =====================================================
 
--- Compress market data older than 1 day
-SELECT add_compression_policy('market_data_seconds', INTERVAL '1 day');
-SELECT add_compression_policy('market_data_minutes', INTERVAL '1 day');
+-- Compression has to be enabled before a policy can be added. Segmenting by
+-- instrument keeps per-contract range scans and GROUP BY symbol, exchange
+-- reading only their own segments; ordering by time serves latest-first reads
+ALTER TABLE market_data_seconds SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = 'symbol, contract, exchange',
+    timescaledb.compress_orderby = 'timestamp DESC'
+);
+ALTER TABLE market_data_minutes SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = 'symbol, contract, exchange',
+    timescaledb.compress_orderby = 'timestamp DESC'
+);
+ALTER TABLE raw_tick_data SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = 'symbol, contract, exchange',
+    timescaledb.compress_orderby = 'timestamp DESC, sequence_number'
+);
+
+-- Second and minute data wait 7 days before compressing, so the admin tool's
+-- default week-long backfills and idempotent re-downloads (INSERT ... ON
+-- CONFLICT DO NOTHING) land in uncompressed chunks instead of forcing
+-- segment decompression
+SELECT add_compression_policy('market_data_seconds', INTERVAL '7 days');
+SELECT add_compression_policy('market_data_minutes', INTERVAL '7 days');
 SELECT add_compression_policy('raw_tick_data', INTERVAL '1 hour');
 
 -- =====================================================
@@ -722,6 +749,21 @@ SELECT
 FROM market_data_seconds
 GROUP BY bucket, symbol, contract, exchange;
 
+-- Daily per-symbol row counts and time range, so data overviews read a few
+-- rows per symbol and day instead of scanning every second bar. Real-time
+-- aggregation adds rows not materialized yet
+CREATE MATERIALIZED VIEW market_data_seconds_symbol_stats
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT 
+    time_bucket('1 day', timestamp) AS bucket,
+    symbol,
+    exchange,
+    COUNT(*) AS bar_count,
+    MIN(timestamp) AS first_bar,
+    MAX(timestamp) AS last_bar
+FROM market_data_seconds
+GROUP BY bucket, symbol, exchange;
+
 -- =====================================================
 -- REFRESH POLICIES FOR CONTINUOUS AGGREGATES
 -- =====================================================
@@ -742,6 +784,13 @@ SELECT add_continuous_aggregate_policy('market_data_1hour',
     end_offset => INTERVAL '15 minutes', 
     schedule_interval => INTERVAL '15 minutes');
 
+-- No start offset: historical backfills land anywhere in the past, and only
+-- invalidated buckets are recomputed
+SELECT add_continuous_aggregate_policy('market_data_seconds_symbol_stats',
+    start_offset => NULL,
+    end_offset => INTERVAL '1 hour',
+    schedule_interval => INTERVAL '5 minutes');
+
 -- =====================================================
 -- GRANT PERMISSIONS
 -- =====================================================
@@ -152,6 +152,37 @@ async def fix_database_issues():
             except Exception as e:
                 logger.warning(f"Could not set retention policy for {policy['table']}: {e}")
         
+        # Scoped per-contract counts on minute data need this index; older
+        # schemas only indexed market_data_seconds by contract
+        logger.info("🔧 Creating missing indexes...")
+        
+        try:
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_market_data_minutes_contract_time
+                ON market_data_minutes (contract, timestamp DESC);
+            """)
+            logger.info("✅ Ensured index idx_market_data_minutes_contract_time")
+        except Exception as e:
+            logger.warning(f"Could not create index idx_market_data_minutes_contract_time: {e}")
+        
+        # Existing hypertables keep their old chunk interval until told
+        # otherwise; only chunks created from now on use the new one
+        logger.info("🔧 Setting chunk intervals...")
+        
+        chunk_intervals = [
+            {'table': 'market_data_seconds', 'interval': "INTERVAL '1 day'"},
+            {'table': 'market_data_minutes', 'interval': "INTERVAL '7 days'"}
+        ]
+        
+        for chunk_interval in chunk_intervals:
+            try:
+                await conn.execute(f"""
+                    SELECT set_chunk_time_interval('{chunk_interval['table']}', {chunk_interval['interval']});
+                """)
+                logger.info(f"✅ Set chunk interval for {chunk_interval['table']}: {chunk_interval['interval']}")
+            except Exception as e:
+                logger.warning(f"Could not set chunk interval for {chunk_interval['table']}: {e}")
+        
         # Step 5: Verify the setup
         logger.info("🔍 Verifying database setup...")
         
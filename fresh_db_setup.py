@@ -249,9 +249,9 @@ async def drop_and_recreate_database():
         logger.info("⏰ Converting tables to hypertables...")
         
         hypertables = [
-            {'table': 'market_data_seconds', 'interval': "INTERVAL '1 minute'"},
+            {'table': 'market_data_seconds', 'interval': "INTERVAL '1 day'"},
             {'table': 'raw_tick_data', 'interval': "INTERVAL '10 seconds'"},
-            {'table': 'market_data_minutes', 'interval': "INTERVAL '1 hour'"},
+            {'table': 'market_data_minutes', 'interval': "INTERVAL '7 days'"},
             {'table': 'features', 'interval': "INTERVAL '1 day'"},
             {'table': 'predictions', 'interval': "INTERVAL '1 day'"},
             {'table': 'trades', 'interval': "INTERVAL '1 day'"}
@@ -274,6 +274,7 @@ async def drop_and_recreate_database():
             "CREATE INDEX IF NOT EXISTS idx_market_data_seconds_symbol_time ON market_data_seconds (symbol, timestamp DESC);",
             "CREATE INDEX IF NOT EXISTS idx_market_data_seconds_contract_time ON market_data_seconds (contract, timestamp DESC);",
             "CREATE INDEX IF NOT EXISTS idx_market_data_seconds_exchange_time ON market_data_seconds (exchange, timestamp DESC);",
+            "CREATE INDEX IF NOT EXISTS idx_market_data_minutes_contract_time ON market_data_minutes (contract, timestamp DESC);",
             "CREATE INDEX IF NOT EXISTS idx_raw_tick_data_contract_time ON raw_tick_data (contract, timestamp DESC);",
             "CREATE INDEX IF NOT EXISTS idx_raw_tick_data_type ON raw_tick_data (tick_type, timestamp DESC);",
             "CREATE INDEX IF NOT EXISTS idx_features_symbol_timeframe_time ON features (symbol, timeframe, timestamp DESC);",
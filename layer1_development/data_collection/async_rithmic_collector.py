@@ -244,7 +244,7 @@ class AsyncRithmicTickCollector:
             )
             
             self.is_connected = True
-            self.stats['start_time'] = datetime.now()
+            self.stats['start_time'] = time.perf_counter()
             
             logger.info("✅ Connected to Rithmic Chicago Gateway for Paper Trading")
             return True
@@ -611,12 +611,14 @@ class AsyncRithmicTickCollector:
             # Import database connection
             from shared.database.connection import get_async_session, TimescaleDBHelper, get_database_manager
             
+            # Exchange code and trading-hours flag are the same for every bar
+            # in the buffer (one contract, flushed once a minute)
+            exchange_code = self._get_exchange_code_for_contract(contract)
+            is_regular_hours = self.is_market_open(second_data[0].symbol)
+            
             # Convert to database format
             data_records = []
             for bar in second_data:
-                # Get exchange code
-                exchange_code = self._get_exchange_code_for_contract(contract)
-                
                 record = {
                     'timestamp': bar.timestamp,
                     'symbol': bar.symbol,
@@ -634,7 +636,7 @@ class AsyncRithmicTickCollector:
                     'ask': float(bar.ask) if bar.ask else None,
                     'spread': float(bar.spread) if bar.spread else None,
                     'data_quality_score': 1.0,  # Assume good quality for real-time data
-                    'is_regular_hours': self.is_market_open(bar.symbol)
+                    'is_regular_hours': is_regular_hours
                 }
                 data_records.append(record)
             
@@ -642,9 +644,10 @@ class AsyncRithmicTickCollector:
             async with get_async_session() as session:
                 # Use the TimescaleDBHelper directly instead of DatabaseManager
                 helper = TimescaleDBHelper(session)
-                # Insert the data records directly
+                # Validate every bar up front, then load the batch in one COPY
                 for record in data_records:
-                    await helper.insert_second_data(record)
+                    helper.validate_market_record(record)
+                await helper.bulk_insert_market_data(data_records)
             
             # Clear buffer
             self.second_data_buffer[contract] = []
@@ -696,6 +699,10 @@ class AsyncRithmicTickCollector:
             df.to_parquet(filename, index=False)
             logger.warning(f"📁 Saved to fallback storage: {filename}")
             
+            # The bars are on disk now; keeping them would grow the buffer for
+            # as long as the database is down and rewrite them into every file
+            self.second_data_buffer[contract] = []
+            
         except Exception as e:
             logger.error(f"Error in fallback storage for {contract}: {e}")
     
@@ -809,8 +816,8 @@ class AsyncRithmicTickCollector:
     
     def get_stats(self) -> Dict:
         """Get collection statistics"""
-        current_time = datetime.now()
-        duration = (current_time - self.stats['start_time']).total_seconds() if self.stats['start_time'] else 0
+        start_time = self.stats['start_time']
+        duration = time.perf_counter() - start_time if start_time is not None else 0
         
         return {
             'ticks_received': self.stats['ticks_received'],
@@ -83,17 +83,12 @@ async def get_front_month_contracts(client, symbols, exchange="CME"):
     Returns:
         Dictionary mapping symbol roots to front month contracts
     """
-    results = {}
+    # One concurrent batch instead of a round trip per symbol
+    from admin_rithmic import get_front_month_contracts as fetch_front_months
+    results = await fetch_front_months(client, symbols, exchange)
     
-    for symbol in symbols:
-        try:
-            # Use the utility function instead of the method
-            from admin_rithmic import get_front_month_contract
-            contract = await get_front_month_contract(client, symbol, exchange)
-            logger.info(f"Front month contract for {symbol}: {contract}")
-            results[symbol] = contract
-        except Exception as e:
-            logger.error(f"Error getting front month contract for {symbol}: {e}")
+    for symbol, contract in results.items():
+        logger.info(f"Front month contract for {symbol}: {contract}")
     
     return results
 
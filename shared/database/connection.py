@@ -236,29 +236,99 @@ class TimescaleDBHelper:
     def __init__(self, session):
         self.session = session
 
-    async def bulk_insert_market_data(self, data: list, table_name: str = 'market_data_seconds'):
-        """Insert market data with improved error handling and logging"""
+    @staticmethod
+    def _to_db_value(value):
+        """Convert pandas timestamps and NaN/NaT to values the driver accepts"""
+        if isinstance(value, pd.Timestamp):
+            return value.to_pydatetime()
+        if pd.isna(value):
+            return None
+        return value
+
+    async def bulk_insert_market_data(self, data: list, table_name: str = 'market_data_seconds',
+                                      commit: bool = True) -> int:
+        """
+        Insert market data, using COPY when the asyncpg driver is available
+        
+        Returns the number of rows inserted. With commit=False the rows stay
+        in the session's open transaction for the caller to commit or roll back;
+        the COPY attempt and every fallback row run in their own savepoints, so
+        a failed batch or bad row never aborts the caller's transaction.
+        """
         if not data:
             logger.warning("No data provided for insertion")
-            return
+            return 0
 
         logger.info(f"Attempting to insert {len(data)} records into {table_name}")
         
+        try:
+            # A failed COPY only rolls back its own savepoint, leaving anything
+            # else pending in the caller's transaction intact
+            async with self.session.begin_nested():
+                inserted_count = await self._copy_insert_market_data(data, table_name)
+        except Exception as e:
+            # COPY is all-or-nothing; the row-by-row path skips bad records instead
+            logger.warning(f"COPY into {table_name} failed ({e}), falling back to row inserts")
+            return await self._row_insert_market_data(data, table_name, commit)
+        
+        if commit:
+            await self.session.commit()
+        logger.info(f"Bulk insert completed: {inserted_count} inserted, {len(data) - inserted_count} duplicates/conflicts")
+        return inserted_count
+
+    async def _copy_insert_market_data(self, data: list, table_name: str) -> int:
+        """
+        Bulk load records through asyncpg's binary COPY
+        
+        COPY cannot skip conflicting rows, so records are copied into a
+        temporary staging table and moved over with INSERT ... ON CONFLICT
+        DO NOTHING, keeping re-downloads idempotent. Returns the number of
+        rows inserted; the caller commits.
+        """
+        columns = list(data[0].keys())
+        records = [tuple(self._to_db_value(record.get(column)) for column in columns) for record in data]
+        column_list = ', '.join(columns)
+        staging_table = f"staging_{table_name}"
+        
+        # Going through the session first opens the transaction, so the raw
+        # COPY below runs inside it and ON COMMIT DROP cleans up the staging
+        # table. Several uncommitted batches in one transaction share it
+        await self.session.execute(text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {staging_table} "
+            f"(LIKE {table_name} INCLUDING DEFAULTS) ON COMMIT DROP"
+        ))
+        await self.session.execute(text(f"TRUNCATE {staging_table}"))
+        
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            staging_table, records=records, columns=columns
+        )
+        
+        result = await self.session.execute(text(
+            f"INSERT INTO {table_name} ({column_list}) "
+            f"SELECT {column_list} FROM {staging_table} ON CONFLICT DO NOTHING"
+        ))
+        return result.rowcount
+
+    async def _row_insert_market_data(self, data: list, table_name: str, commit: bool = True) -> int:
+        """
+        Insert market data one row at a time, tolerating a few bad records
+        
+        Each row runs in its own savepoint: on PostgreSQL a failed statement
+        aborts the whole transaction, so without one the first bad row would
+        make every later row fail and the final commit roll everything back.
+        """
         try:
             inserted_count = 0
             failed_count = 0
+            processed_count = 0
             
             for i, record in enumerate(data):
+                processed_count = i + 1
                 try:
                     # Process the record to handle pandas timestamps and NaN values
-                    processed_record = {}
-                    for key, value in record.items():
-                        if isinstance(value, pd.Timestamp):
-                            processed_record[key] = value.to_pydatetime()
-                        elif pd.isna(value):
-                            processed_record[key] = None
-                        else:
-                            processed_record[key] = value
+                    processed_record = {key: self._to_db_value(value) for key, value in record.items()}
 
                     # Build the SQL statement dynamically
                     columns = list(processed_record.keys())
@@ -270,7 +340,8 @@ class TimescaleDBHelper:
                         ON CONFLICT DO NOTHING
                     """)
                     
-                    result = await self.session.execute(sql, processed_record)
+                    async with self.session.begin_nested():
+                        result = await self.session.execute(sql, processed_record)
                     
                     # Check if the insert was successful (not a conflict)
                     if result.rowcount > 0:
@@ -278,29 +349,35 @@ class TimescaleDBHelper:
                     
                     # Log progress every 100 records for large datasets
                     if (i + 1) % 100 == 0:
-                        logger.debug(f"Processed {i + 1}/{len(data)} records")
+                        logger.debug("Processed %d/%d records", i + 1, len(data))
                         
                 except Exception as e:
                     failed_count += 1
-                    logger.error(f"Error inserting record {i}: {e}")
-                    logger.debug(f"Problematic record: {record}")
+                    logger.error("Error inserting record %d: %s", i, e)
+                    logger.debug("Problematic record: %s", record)
                     
                     # If too many failures, stop processing
                     if failed_count > 10:
-                        logger.error("Too many insertion failures, stopping bulk insert")
+                        logger.error("Too many insertion failures, stopping bulk insert; %d records not attempted",
+                                     len(data) - processed_count)
                         break
             
             # Commit the transaction
-            await self.session.commit()
+            if commit:
+                await self.session.commit()
             
-            logger.info(f"Bulk insert completed: {inserted_count} inserted, {failed_count} failed, {len(data) - inserted_count - failed_count} duplicates/conflicts")
+            logger.info(f"Bulk insert completed: {inserted_count} inserted, {failed_count} failed, {processed_count - inserted_count - failed_count} duplicates/conflicts")
             
             if failed_count > 0:
                 logger.warning(f"{failed_count} records failed to insert - check logs for details")
+            
+            return inserted_count
                 
         except Exception as e:
             logger.error(f"Fatal error in bulk insert to {table_name}: {e}")
-            await self.session.rollback()
+            # With commit=False the transaction belongs to the caller
+            if commit:
+                await self.session.rollback()
             raise
 
     async def get_latest_data(self, symbol: str, exchange: Optional[str] = None,
@@ -326,25 +403,29 @@ class TimescaleDBHelper:
         else:
             return pd.DataFrame()
 
+    @staticmethod
+    def validate_market_record(record: Dict[str, Any]) -> None:
+        """Raise ValueError if a market data record is incomplete or has inconsistent OHLC"""
+        # Validate required fields
+        required_fields = ['timestamp', 'symbol', 'contract', 'exchange', 'open', 'high', 'low', 'close']
+        missing_fields = [field for field in required_fields if field not in record or record[field] is None]
+        
+        if missing_fields:
+            raise ValueError(f"Missing required fields: {missing_fields}")
+        
+        # Validate OHLC data
+        ohlc = [record['open'], record['high'], record['low'], record['close']]
+        if not all(isinstance(x, (int, float)) and x > 0 for x in ohlc):
+            raise ValueError(f"Invalid OHLC data: {ohlc}")
+            
+        if not (record['high'] >= max(record['open'], record['close']) and 
+               record['low'] <= min(record['open'], record['close'])):
+            raise ValueError(f"OHLC validation failed: H={record['high']}, L={record['low']}, O={record['open']}, C={record['close']}")
+
     async def insert_second_data(self, record: Dict[str, Any], table_name: str = 'market_data_seconds') -> None:
         """Insert a single second data record with validation"""
         try:
-            # Validate required fields
-            required_fields = ['timestamp', 'symbol', 'contract', 'exchange', 'open', 'high', 'low', 'close']
-            missing_fields = [field for field in required_fields if field not in record or record[field] is None]
-            
-            if missing_fields:
-                raise ValueError(f"Missing required fields: {missing_fields}")
-            
-            # Validate OHLC data
-            ohlc = [record['open'], record['high'], record['low'], record['close']]
-            if not all(isinstance(x, (int, float)) and x > 0 for x in ohlc):
-                raise ValueError(f"Invalid OHLC data: {ohlc}")
-                
-            if not (record['high'] >= max(record['open'], record['close']) and 
-                   record['low'] <= min(record['open'], record['close'])):
-                raise ValueError(f"OHLC validation failed: H={record['high']}, L={record['low']}, O={record['open']}, C={record['close']}")
-            
+            self.validate_market_record(record)
             await self.bulk_insert_market_data([record], table_name)
             logger.debug(f"Successfully inserted 1 record to {table_name}")
             